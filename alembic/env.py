@@ -8,7 +8,7 @@ import sys
 # Adiciona o diretório raiz ao sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.database import Base
+from app.database import Base, DIRECTORY_DATABASE_URL, SHARD_DATABASE_URLS
 from app import models
 
 # Configuração Alembic
@@ -16,6 +16,47 @@ config = context.config
 fileConfig(config.config_file_name)
 target_metadata = Base.metadata
 
+# Papéis de um banco: guarda tabelas de shard, o diretório global, ou ambos
+TODOS_OS_PAPEIS = frozenset({"shard", "diretorio"})
+
+
+def bancos_a_migrar():
+    """
+    Lista os bancos que recebem as migrações e o papel de cada um.
+
+    Com SHARD_DATABASE_URLS ou DIRECTORY_DATABASE_URL definidos, migra cada
+    shard e o banco do diretório (uma URL repetida é migrada uma única vez).
+    Sem eles, migra apenas o `sqlalchemy.url` do alembic.ini, com os dois papéis.
+
+    Os shards vêm antes do diretório, com o shard0 (o banco original) primeiro:
+    a migração do diretório lê os usuários já existentes do shard0.
+
+    Returns:
+        dict: URL -> conjunto de papéis ("shard" e/ou "diretorio").
+    """
+    if not ({"SHARD_DATABASE_URLS", "DIRECTORY_DATABASE_URL"} & os.environ.keys()):
+        return {config.get_main_option("sqlalchemy.url"): TODOS_OS_PAPEIS}
+    bancos = {}
+    for url in SHARD_DATABASE_URLS:
+        bancos.setdefault(url, set()).add("shard")
+    bancos.setdefault(DIRECTORY_DATABASE_URL, set()).add("diretorio")
+    return bancos
+
+
+def incluir_objeto(papeis):
+    """
+    Filtro do autogenerate: só compara as tabelas que pertencem aos papéis do banco.
+
+    Tabelas marcadas com `info={"global": True}` pertencem ao diretório; as demais, aos shards.
+    """
+    def incluir(objeto, nome, tipo, refletido, comparado):
+        if tipo != "table":
+            return True
+        tabela = target_metadata.tables.get(nome)
+        papel = "diretorio" if tabela is not None and tabela.info.get("global") else "shard"
+        return papel in papeis
+    return incluir
+
 def run_migrations_offline():
     """Executa as migrações no modo offline (sem conexão com banco)."""
     url = config.get_main_option("sqlalchemy.url")
@@ -30,21 +71,34 @@ def run_migrations_offline():
         context.run_migrations()
 
 def run_migrations_online():
-    """Executa as migrações com conexão ativa com o banco."""
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    """
+    Executa as migrações com conexão ativa, em cada shard e no banco do diretório.
+
+    As migrações consultam `config.attributes["papeis"]` para decidir o que
+    criar em cada banco. O autogenerate compara apenas com o primeiro banco.
+    """
+    bancos = bancos_a_migrar()
+    if getattr(config.cmd_opts, "autogenerate", False):
+        bancos = dict([next(iter(bancos.items()))])
+    shard0 = next(iter(bancos))
+
+    for url, papeis in bancos.items():
+        secao = config.get_section(config.config_ini_section, {})
+        secao["sqlalchemy.url"] = url
+        connectable = engine_from_config(secao, prefix="sqlalchemy.", poolclass=pool.NullPool)
+        config.attributes["papeis"] = papeis
+        # URL do shard0 para migrações que precisam ler dele a partir de outro banco
+        config.attributes["url_shard0"] = None if url == shard0 else shard0
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata
-        )
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                include_object=incluir_objeto(papeis),
+            )
 
-        with context.begin_transaction():
-            context.run_migrations()
+            with context.begin_transaction():
+                context.run_migrations()
 
 if context.is_offline_mode():
     run_migrations_offline()
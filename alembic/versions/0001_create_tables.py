@@ -2,7 +2,7 @@
 """
 Cria tabelas de usuários e tarefas
 """
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 import sqlalchemy.dialects.postgresql as pg
 import uuid
@@ -13,7 +13,13 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+def _banco_de_shard():
+    # Usuários e tarefas só existem nos shards (ver bancos_a_migrar em env.py)
+    return "shard" in context.config.attributes.get("papeis", {"shard"})
+
 def upgrade():
+    if not _banco_de_shard():
+        return
     op.create_table(
         'usuarios',
         sa.Column('id', pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
@@ -36,6 +42,8 @@ def upgrade():
     )
 
 def downgrade():
+    if not _banco_de_shard():
+        return
     op.drop_table('tarefas')
     op.drop_table('usuarios')
     op.execute("DROP TYPE IF EXISTS prioridadeenum")
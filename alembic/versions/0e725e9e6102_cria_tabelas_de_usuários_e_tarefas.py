@@ -7,7 +7,7 @@ Create Date: 2025-08-01 15:31:44.824371
 """
 from typing import Sequence, Union
 
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
@@ -18,8 +18,15 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _banco_de_shard() -> bool:
+    """Indica se o banco migrado é um shard (ver bancos_a_migrar em env.py)."""
+    return "shard" in context.config.attributes.get("papeis", {"shard"})
+
+
 def upgrade() -> None:
     """Upgrade schema."""
+    if not _banco_de_shard():
+        return
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('tarefas', sa.Column('atualizada_em', sa.DateTime(), nullable=True))
     op.alter_column('tarefas', 'prioridade',
@@ -43,6 +50,8 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    if not _banco_de_shard():
+        return
     # ### commands auto generated by Alembic - please adjust! ###
     op.alter_column('usuarios', 'criado_em',
                existing_type=postgresql.TIMESTAMP(),
@@ -0,0 +1,71 @@
+"""cria diretório global de usuários
+
+Revision ID: 4c2f9a7d1e3b
+Revises: 0e725e9e6102
+Create Date: 2026-10-19 10:12:31.502114
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4c2f9a7d1e3b'
+down_revision: Union[str, Sequence[str], None] = '0e725e9e6102'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _banco_do_diretorio() -> bool:
+    """Indica se o banco migrado guarda o diretório (ver bancos_a_migrar em env.py)."""
+    return "diretorio" in context.config.attributes.get("papeis", {"diretorio"})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _banco_do_diretorio():
+        return
+    diretorio = op.create_table(
+        'diretorio_usuarios',
+        sa.Column('usuario_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('email', sa.String(), nullable=False, unique=True),
+        sa.Column('shard', sa.String(), nullable=False),
+    )
+    # Usuários existentes vivem no banco original, que passa a ser o shard0
+    url_shard0 = context.config.attributes.get("url_shard0")
+    if url_shard0 is None:
+        # O diretório está no próprio shard0
+        op.execute(
+            "INSERT INTO diretorio_usuarios (usuario_id, email, shard) "
+            "SELECT id, email, 'shard0' FROM usuarios"
+        )
+        return
+
+    # Diretório em banco separado: lê os usuários do shard0 (migrado antes, ver env.py)
+    engine = sa.create_engine(url_shard0, poolclass=sa.pool.NullPool)
+    try:
+        with engine.connect() as conn:
+            if not sa.inspect(conn).has_table('usuarios'):
+                return
+            usuarios = sa.table(
+                'usuarios', sa.column('id', postgresql.UUID(as_uuid=True)), sa.column('email')
+            )
+            resultado = conn.execution_options(yield_per=10_000).execute(
+                sa.select(usuarios.c.id, usuarios.c.email)
+            )
+            for linhas in resultado.partitions():
+                op.bulk_insert(
+                    diretorio,
+                    [{'usuario_id': id_, 'email': email, 'shard': 'shard0'} for id_, email in linhas],
+                )
+    finally:
+        engine.dispose()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _banco_do_diretorio():
+        return
+    op.drop_table('diretorio_usuarios')
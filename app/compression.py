@@ -0,0 +1,153 @@
+# app/compression.py
+
+import os
+import zlib
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.negotiation import qualidades
+
+# Respostas menores que isso são enviadas sem compressão
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+
+class _Gzip:
+    """Compressor gzip incremental."""
+    encoding = "gzip"
+
+    def __init__(self):
+        self._obj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class _Zstd:
+    """Compressor zstd incremental."""
+    encoding = "zstd"
+
+    def __init__(self):
+        self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+
+# Ordem de preferência do servidor quando o cliente aceita mais de uma codificação
+COMPRESSORES = {"zstd": _Zstd, "gzip": _Gzip}
+
+
+def escolher_codificacao(accept_encoding: str) -> str | None:
+    """
+    Escolhe a codificação de conteúdo a partir do cabeçalho Accept-Encoding.
+
+    Args:
+        accept_encoding (str): Valor do cabeçalho Accept-Encoding.
+
+    Returns:
+        str | None: "zstd", "gzip" ou None se nenhuma for aceita.
+    """
+    aceitas = qualidades(accept_encoding)
+    melhor, melhor_q = None, 0.0
+    for codificacao in COMPRESSORES:
+        q = aceitas.get(codificacao, aceitas.get("*", 0.0))
+        if q > melhor_q:
+            melhor, melhor_q = codificacao, q
+    return melhor
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime respostas com zstd ou gzip.
+
+    Respostas completas só são comprimidas acima de `minimum_size` bytes.
+    Respostas em streaming são comprimidas incrementalmente: cada pedaço é
+    comprimido e descarregado assim que chega, sem acumular o corpo inteiro.
+
+    Args:
+        app (ASGIApp): Aplicação ASGI envolvida.
+        minimum_size (int): Tamanho mínimo do corpo para aplicar compressão.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, COMPRESSORES[codificacao], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Intercepta as mensagens de resposta e aplica a compressão escolhida."""
+
+    def __init__(self, send: Send, compressor_class, minimum_size: int):
+        self._send = send
+        self._compressor_class = compressor_class
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Adia o início até conhecer o primeiro pedaço do corpo
+            self._start = message
+            headers = Headers(raw=message["headers"])
+            self._passthrough = "content-encoding" in headers
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            if self._start is not None:
+                await self._send(self._start)
+                self._start = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            headers = MutableHeaders(raw=self._start["headers"])
+            # Comprimida ou não, a resposta depende do Accept-Encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self._minimum_size:
+                # Resposta completa e pequena: segue sem compressão
+                self._passthrough = True
+                await self._send(self._start)
+                self._start = None
+                await self._send(message)
+                return
+
+            self._compressor = self._compressor_class()
+            headers["Content-Encoding"] = self._compressor.encoding
+            if more_body:
+                del headers["Content-Length"]
+                body = self._compressor.compress(body)
+            else:
+                body = self._compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+            await self._send(self._start)
+            self._start = None
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        body = self._compressor.compress(body) if more_body else self._compressor.finish(body)
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,190 @@
+# app/group_commit.py
+
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, InvalidStateError, TimeoutError
+
+from sqlalchemy import insert
+
+from app.database import shard_engines
+from app.models import Tarefa
+
+# Modo group commit - desligado por padrão
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "0") == "1"
+# Máximo de linhas gravadas num único INSERT/transação
+GROUP_COMMIT_MAX_LINHAS = int(os.getenv("GROUP_COMMIT_MAX_LINHAS", "200"))
+# Orçamento de latência: tempo máximo que uma linha espera na fila antes do flush
+GROUP_COMMIT_MAX_ESPERA_MS = float(os.getenv("GROUP_COMMIT_MAX_ESPERA_MS", "5"))
+# Profundidade máxima da fila; acima disso novas inserções são recusadas
+GROUP_COMMIT_MAX_FILA = int(os.getenv("GROUP_COMMIT_MAX_FILA", "10000"))
+# Tempo máximo de gravação do lote; somado à espera na fila, limita quanto a requisição aguarda
+GROUP_COMMIT_MAX_GRAVACAO_MS = float(os.getenv("GROUP_COMMIT_MAX_GRAVACAO_MS", "2000"))
+
+tarefas = Tarefa.__table__
+
+
+class FilaCheia(Exception):
+    """Levantada quando a fila do group commit atingiu a profundidade máxima."""
+
+
+class TempoEsgotado(Exception):
+    """Levantada quando a linha não foi gravada dentro do tempo máximo de espera."""
+
+
+class GroupCommitWriter:
+    """
+    Gravador em segundo plano que agrupa inserções de tarefas concorrentes.
+
+    Cada requisição enfileira sua linha e espera. Uma thread junta as linhas
+    até atingir `max_linhas` ou até a linha mais antiga do lote estourar o
+    orçamento de `max_espera_ms` (linhas já acumuladas na fila entram no lote
+    mesmo depois do prazo), e grava o lote num único INSERT com várias
+    linhas, numa única transação por shard. Se o lote falhar, as linhas são
+    regravadas uma a uma para que apenas as inválidas recebam o erro.
+
+    A thread usa conexões do mesmo pool das requisições: quem chama `submit`
+    não deve estar segurando uma conexão do shard enquanto espera.
+
+    Args:
+        max_linhas (int): Tamanho máximo do lote.
+        max_espera_ms (float): Tempo máximo de espera de uma linha na fila.
+        max_fila (int): Profundidade máxima da fila.
+        max_gravacao_ms (float): Tempo máximo de gravação do lote.
+    """
+
+    def __init__(
+        self,
+        max_linhas: int = GROUP_COMMIT_MAX_LINHAS,
+        max_espera_ms: float = GROUP_COMMIT_MAX_ESPERA_MS,
+        max_fila: int = GROUP_COMMIT_MAX_FILA,
+        max_gravacao_ms: float = GROUP_COMMIT_MAX_GRAVACAO_MS,
+    ):
+        self.max_linhas = max_linhas
+        self.max_espera = max_espera_ms / 1000
+        self.timeout = (max_espera_ms + max_gravacao_ms) / 1000
+        self._fila = queue.Queue(maxsize=max_fila)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, shard: str, linha: dict) -> Tarefa:
+        """
+        Enfileira uma tarefa e bloqueia até o lote que a contém ser gravado.
+
+        Se o prazo (espera na fila + gravação) estourar, a linha é cancelada
+        caso ainda não tenha entrado num lote; se já estiver sendo gravada,
+        pode chegar ao banco mesmo com o erro devolvido ao chamador.
+
+        Args:
+            shard (str): Shard do dono da tarefa.
+            linha (dict): Valores de todas as colunas da tarefa, inclusive o id.
+
+        Returns:
+            Tarefa: Tarefa gravada (desanexada de sessão).
+
+        Raises:
+            FilaCheia: Se a fila estiver na profundidade máxima.
+            TempoEsgotado: Se a gravação não terminar dentro do prazo.
+        """
+        self._iniciar()
+        future = Future()
+        try:
+            self._fila.put_nowait((time.monotonic(), shard, linha, future))
+        except queue.Full:
+            raise FilaCheia("Fila de gravação cheia")
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TempoEsgotado("Gravação em lote não concluída no prazo")
+
+    def stop(self) -> None:
+        """Grava o que estiver na fila e encerra a thread."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._fila.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _iniciar(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._fila.get()
+            if item is None:
+                return
+            lote = [item]
+            prazo = item[0] + self.max_espera
+            encerrar = False
+            while len(lote) < self.max_linhas:
+                # Com fila acumulada, o que já está esperando entra no lote mesmo
+                # após o prazo; só se espera por novas linhas com a fila vazia.
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    try:
+                        item = self._fila.get(timeout=restante)
+                    except queue.Empty:
+                        break
+                if item is None:
+                    encerrar = True
+                    break
+                lote.append(item)
+            try:
+                self._gravar(lote)
+            except Exception as exc:
+                # Um erro inesperado falha só este lote; a thread continua atendendo a fila
+                self._falhar(lote, exc)
+            if encerrar:
+                return
+
+    @staticmethod
+    def _falhar(lote: list, exc: Exception) -> None:
+        for _, _, _, future in lote:
+            try:
+                if not future.done():
+                    future.set_exception(exc)
+            except InvalidStateError:
+                pass  # cancelado pelo chamador nesse meio tempo
+
+    def _gravar(self, lote: list) -> None:
+        por_shard = defaultdict(list)
+        for _, shard, linha, future in lote:
+            # Descarta linhas cujo chamador já desistiu por tempo esgotado
+            if future.set_running_or_notify_cancel():
+                por_shard[shard].append((linha, future))
+
+        for shard, itens in por_shard.items():
+            engine = shard_engines[shard]
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(tarefas).values([linha for linha, _ in itens]))
+            except Exception:
+                # Isola a falha: cada linha tenta de novo na sua própria transação
+                for linha, future in itens:
+                    try:
+                        with engine.begin() as conn:
+                            conn.execute(insert(tarefas).values(linha))
+                    except Exception as exc:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(Tarefa(**linha))
+            else:
+                for linha, future in itens:
+                    future.set_result(Tarefa(**linha))
+
+
+# Instância usada por create_tarefa quando o modo está ligado
+writer = GroupCommitWriter() if GROUP_COMMIT else None
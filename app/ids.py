@@ -0,0 +1,82 @@
+# app/ids.py
+
+import os
+import threading
+import time
+import uuid
+
+# Estado do gerador: último timestamp emitido e contador dentro do mesmo milissegundo
+_lock = threading.Lock()
+_ultimo_ms = 0
+_contador = 0
+
+_MASCARA_CONTADOR = 0xFFF  # 12 bits (campo rand_a)
+
+
+def uuid7_int(timestamp_ms: int, aleatorio: int) -> int:
+    """
+    Monta o valor inteiro de 128 bits de um UUIDv7 (RFC 9562).
+
+    Args:
+        timestamp_ms (int): Milissegundos desde a época Unix (48 bits).
+        aleatorio (int): 74 bits aleatórios (12 de rand_a e 62 de rand_b).
+
+    Returns:
+        int: Valor do UUID, com os campos de versão e variante preenchidos.
+    """
+    rand_a = (aleatorio >> 62) & 0xFFF
+    rand_b = aleatorio & ((1 << 62) - 1)
+    return (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    )
+
+
+def uuid7_de(timestamp_ms: int, aleatorio: int) -> uuid.UUID:
+    """
+    Monta um UUIDv7 a partir de um timestamp e de bits aleatórios.
+
+    Args:
+        timestamp_ms (int): Milissegundos desde a época Unix (48 bits).
+        aleatorio (int): 74 bits aleatórios.
+
+    Returns:
+        UUID: Identificador versão 7 ordenável pelo tempo de criação.
+    """
+    return uuid.UUID(int=uuid7_int(timestamp_ms, aleatorio))
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Gera um novo UUIDv7 monotônico dentro do processo.
+
+    Os 48 bits mais significativos carregam o timestamp em milissegundos, de modo
+    que chaves novas são sempre inseridas no fim do índice da chave primária.
+    Chamadas no mesmo milissegundo incrementam o campo rand_a como contador,
+    preservando a ordem mesmo sob alta taxa de inserção.
+
+    Returns:
+        UUID: Identificador versão 7.
+    """
+    global _ultimo_ms, _contador
+
+    aleatorio = int.from_bytes(os.urandom(10), "big") >> 6  # 74 bits
+    with _lock:
+        agora = time.time_ns() // 1_000_000
+        if agora > _ultimo_ms:
+            _ultimo_ms = agora
+            # Semente com o bit mais alto zerado deixa folga para o contador
+            _contador = (aleatorio >> 62) & (_MASCARA_CONTADOR >> 1)
+        else:
+            # Mesmo milissegundo (ou relógio voltou): avança o contador e,
+            # se ele estourar, empresta o próximo milissegundo.
+            _contador += 1
+            if _contador > _MASCARA_CONTADOR:
+                _ultimo_ms += 1
+                _contador = 0
+        ms, contador = _ultimo_ms, _contador
+
+    return uuid7_de(ms, contador << 62 | (aleatorio & ((1 << 62) - 1)))
@@ -1,16 +1,34 @@
 # app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from app import group_commit
+from app.compression import CompressionMiddleware
 from app.routes import auth, tasks
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida da aplicação: grava as tarefas pendentes do group commit antes de encerrar."""
+    yield
+    if group_commit.writer is not None:
+        group_commit.writer.stop()
+
+
 app = FastAPI(
     title="TODO API",
     version="1.0",
-    description="API de gerenciamento de tarefas com autenticação JWT."
+    description="API de gerenciamento de tarefas com autenticação JWT.",
+    lifespan=lifespan,
 )
 
+# Comprime respostas grandes com zstd/gzip conforme o Accept-Encoding do cliente
+app.add_middleware(CompressionMiddleware)
+
 # Inclui as rotas de autenticação no prefixo /auth
 app.include_router(auth.router, prefix="/auth", tags=["Autenticação"])
 
 # Inclui as rotas de tarefas no prefixo /tasks
 app.include_router(tasks.router, prefix="/tasks", tags=["Tarefas"])
+
@@ -5,9 +5,9 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
-import uuid
 
 from app.database import Base
+from app.ids import uuid7
 
 
 class PrioridadeEnum(str, enum.Enum):
@@ -29,7 +29,7 @@ class Usuario(Base):
     Modelo de usuário do sistema.
 
     Atributos:
-        id (UUID): Identificador único do usuário.
+        id (UUID): Identificador único do usuário (UUIDv7, ordenado pelo tempo).
         nome (str): Nome completo do usuário.
         email (str): E-mail único do usuário.
         senha_hash (str): Hash da senha para autenticação.
@@ -38,7 +38,7 @@ class Usuario(Base):
     """
     __tablename__ = "usuarios"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     nome = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
     senha_hash = Column(String, nullable=False)
@@ -52,7 +52,7 @@ class Tarefa(Base):
     Modelo de tarefa atribuída a um usuário.
 
     Atributos:
-        id (UUID): Identificador único da tarefa.
+        id (UUID): Identificador único da tarefa (UUIDv7, ordenado pelo tempo).
         titulo (str): Título da tarefa.
         descricao (str): Descrição detalhada da tarefa.
         data_vencimento (datetime): Data limite para conclusão.
@@ -64,7 +64,7 @@ class Tarefa(Base):
     """
     __tablename__ = "tarefas"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     titulo = Column(String, nullable=False)
     descricao = Column(Text)
     data_vencimento = Column(DateTime)
@@ -75,3 +75,23 @@ class Tarefa(Base):
     dono_id = Column(UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False)
     dono = relationship("Usuario", back_populates="tarefas")
     atualizada_em = Column(DateTime, default=datetime.utcnow)
+
+
+class DiretorioUsuario(Base):
+    """
+    Diretório global que localiza o shard de cada usuário.
+
+    Fica no banco do diretório (tabela marcada como global) e é consultado no
+    login, pelo e-mail, e a cada requisição autenticada, pelo id do token.
+
+    Atributos:
+        usuario_id (UUID): Id do usuário.
+        email (str): E-mail único do usuário.
+        shard (str): Nome do shard que guarda o usuário e suas tarefas.
+    """
+    __tablename__ = "diretorio_usuarios"
+    __table_args__ = {"info": {"global": True}}
+
+    usuario_id = Column(UUID(as_uuid=True), primary_key=True)
+    email = Column(String, unique=True, nullable=False)
+    shard = Column(String, nullable=False)
@@ -0,0 +1,131 @@
+# app/negotiation.py
+
+from typing import Any, Callable
+
+import msgpack
+from fastapi import Request, Response
+from fastapi import routing
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class MsgPackResponse(Response):
+    """
+    Resposta serializada em MessagePack.
+
+    Recebe o conteúdo já convertido pelo `response_model`/`jsonable_encoder`
+    (UUIDs e datetimes como strings canônicas e ISO 8601) e o codifica uma
+    única vez. Assim `msgpack.unpackb(corpo)` devolve exatamente o mesmo
+    objeto que `json.loads` devolveria para a versão JSON.
+    """
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def qualidades(cabecalho: str) -> dict:
+    """
+    Converte um cabeçalho no formato do Accept em um mapa valor -> fator de qualidade (q).
+
+    Args:
+        cabecalho (str): Valor de um cabeçalho Accept ou Accept-Encoding.
+
+    Returns:
+        dict: Mapa de cada valor (em minúsculas) para seu q entre 0 e 1.
+    """
+    resultado = {}
+    for item in cabecalho.split(","):
+        partes = [p.strip() for p in item.split(";")]
+        q = 1.0
+        for param in partes[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if partes[0]:
+            resultado[partes[0].lower()] = q
+    return resultado
+
+
+def prefere_msgpack(request: Request) -> bool:
+    """
+    Indica se o cliente pediu MessagePack com preferência maior ou igual a JSON.
+
+    Args:
+        request (Request): Requisição atual.
+
+    Returns:
+        bool: True se a resposta deve ser codificada em MessagePack.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return False
+    aceitos = qualidades(accept)
+    q_msgpack = max(aceitos.get(tipo, 0.0) for tipo in MSGPACK_MEDIA_TYPES)
+    return q_msgpack > 0 and q_msgpack >= aceitos.get("application/json", 0.0)
+
+
+def resposta_negociada(request: Request, conteudo: Any) -> Response:
+    """
+    Monta uma resposta no formato negociado, para rotas que devolvem a resposta diretamente.
+
+    Args:
+        request (Request): Requisição atual.
+        conteudo (Any): Conteúdo da resposta.
+
+    Returns:
+        Response: MsgPackResponse ou JSONResponse.
+    """
+    classe = MsgPackResponse if prefere_msgpack(request) else JSONResponse
+    return classe(jsonable_encoder(conteudo))
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Rota que escolhe entre JSON e MessagePack a partir do cabeçalho Accept.
+
+    A rota monta dois handlers: o padrão do FastAPI, que mantém o caminho
+    rápido de serialização JSON do pydantic, e outro com `MsgPackResponse`,
+    que codifica a saída do `response_model` direto em MessagePack. O
+    cabeçalho Accept decide qual deles atende a requisição. Sem `Accept`
+    pedindo MessagePack, o contrato JSON permanece inalterado.
+    """
+
+    def _rota_efetiva(self):
+        # Rotas incluídas em outro router são processadas a partir de um contexto
+        # próprio (com as dependências e a classe de resposta herdadas do router)
+        contexto_var = getattr(routing, "_effective_route_context_var", None)
+        contexto = contexto_var.get() if contexto_var is not None else None
+        if contexto is not None and contexto.original_route is self:
+            return contexto
+        return self
+
+    def get_route_handler(self) -> Callable:
+        json_handler = super().get_route_handler()
+
+        rota = self._rota_efetiva()
+        classe = rota.response_class
+        if not isinstance(classe, DefaultPlaceholder):
+            # Classe de resposta explícita: a rota responde sempre nela
+            return json_handler
+        rota.response_class = MsgPackResponse
+        try:
+            msgpack_handler = super().get_route_handler()
+        finally:
+            rota.response_class = classe
+
+        async def handler(request: Request) -> Response:
+            if prefere_msgpack(request):
+                response = await msgpack_handler(request)
+            else:
+                response = await json_handler(request)
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return handler
@@ -1,27 +1,74 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, load_only
 from uuid import UUID
-from app.models import Usuario, Tarefa
+from app import group_commit
+from app.database import shard_ring
+from app.ids import uuid7
+from app.models import DiretorioUsuario, Usuario, Tarefa
 from app.schemas import UserCreate, TarefaBase
 from datetime import datetime
 
+def _usuario_do_diretorio(db: Session, entrada: DiretorioUsuario | None) -> Usuario | None:
+    # Seleciona o shard do usuário para o restante da requisição
+    if entrada is None:
+        return None
+    db.use_shard(entrada.shard)
+    return db.query(Usuario).filter(Usuario.id == entrada.usuario_id).first()
+
 def get_user_by_email(db: Session, email: str) -> Usuario | None:
-    return db.query(Usuario).filter(Usuario.email == email).first()
+    entrada = db.query(DiretorioUsuario).filter(DiretorioUsuario.email == email).first()
+    return _usuario_do_diretorio(db, entrada)
 
 def get_user_by_id(db: Session, user_id: UUID) -> Usuario | None:
-    return db.query(Usuario).filter(Usuario.id == user_id).first()
+    return _usuario_do_diretorio(db, db.get(DiretorioUsuario, user_id))
+
+def email_registrado(db: Session, email: str) -> bool:
+    # Consulta só o diretório: uma entrada sem linha no shard (cadastro em
+    # andamento ou interrompido) também reserva o e-mail
+    return db.query(DiretorioUsuario.usuario_id).filter(DiretorioUsuario.email == email).first() is not None
 
 def create_user(db: Session, user_data: UserCreate, senha_hash: str) -> Usuario:
+    # Diretório e shard podem estar em bancos diferentes, então são dois commits.
+    # Ordem: primeiro a entrada do diretório (reserva o e-mail, que é único ali),
+    # depois a linha no shard. Se a segunda falhar, a entrada é removida; enquanto
+    # isso (ou se a remoção também falhar), a entrada sem usuário no shard não
+    # permite login, mas continua reservando o e-mail (ver email_registrado).
+    usuario_id = uuid7()
+    shard = shard_ring.shard_for(usuario_id)
+    db.add(DiretorioUsuario(usuario_id=usuario_id, email=user_data.email, shard=shard))
+    db.commit()
+
+    db.use_shard(shard)
     usuario = Usuario(
+        id=usuario_id,
         nome=user_data.nome,
         email=user_data.email,
         senha_hash=senha_hash,
     )
     db.add(usuario)
-    db.commit()
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        db.query(DiretorioUsuario).filter(DiretorioUsuario.usuario_id == usuario_id).delete()
+        db.commit()
+        raise
     db.refresh(usuario)
     return usuario
 
 def create_tarefa(db: Session, tarefa_data: TarefaBase, usuario_id: UUID) -> Tarefa:
+    if group_commit.writer is not None:
+        # Modo group commit: a linha é gravada em lote junto com as de outras requisições.
+        # Encerra a transação de leitura (busca do usuário) para devolver a conexão ao
+        # pool antes de esperar: a thread do lote grava usando esse mesmo pool.
+        db.commit()
+        agora = datetime.utcnow()
+        return group_commit.writer.submit(db.shard, {
+            **tarefa_data.dict(),
+            "id": uuid7(),
+            "dono_id": usuario_id,
+            "criado_em": agora,
+            "atualizada_em": agora,
+        })
     tarefa = Tarefa(
         **tarefa_data.dict(),
         dono_id=usuario_id,
@@ -33,11 +80,23 @@ def create_tarefa(db: Session, tarefa_data: TarefaBase, usuario_id: UUID) -> Tar
     db.refresh(tarefa)
     return tarefa
 
-def get_tarefa(db: Session, tarefa_id: UUID, usuario_id: UUID) -> Tarefa | None:
-    return db.query(Tarefa).filter(Tarefa.id == tarefa_id, Tarefa.dono_id == usuario_id).first()
+def _somente(campos: list[str]):
+    # Carrega apenas as colunas pedidas; as demais ficam adiadas
+    return load_only(*(getattr(Tarefa, campo) for campo in campos))
+
+def get_tarefa(db: Session, tarefa_id: UUID, usuario_id: UUID, campos: list[str] = None) -> Tarefa | None:
+    query = db.query(Tarefa).filter(Tarefa.id == tarefa_id, Tarefa.dono_id == usuario_id)
+    if campos:
+        query = query.options(_somente(campos))
+    return query.first()
 
-def get_tarefas_by_user(db: Session, usuario_id: UUID, status: str = None, prioridade: str = None):
+def get_tarefas_by_user(db: Session, usuario_id: UUID, status: str = None, prioridade: str = None,
+                        campos: list[str] = None):
     query = db.query(Tarefa).filter(Tarefa.dono_id == usuario_id)
+    if campos:
+        query = query.options(_somente(campos))
+    else:
+        query = query.options(defer(Tarefa.descricao))
     if status:
         query = query.filter(Tarefa.status == status)
     if prioridade:
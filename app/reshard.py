@@ -0,0 +1,113 @@
+# app/reshard.py
+"""
+Move um usuário e suas tarefas para outro shard, sem tirar a API do ar.
+
+Uso:
+    python -m app.reshard <usuario_id> <shard_destino>
+"""
+import argparse
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, update
+
+from app.database import directory_engine, shard_engines
+from app.models import DiretorioUsuario, Tarefa, Usuario
+
+usuarios = Usuario.__table__
+tarefas = Tarefa.__table__
+diretorio = DiretorioUsuario.__table__
+
+
+def _apagar_usuario(conn, usuario_id: UUID) -> None:
+    """Remove o usuário e suas tarefas do shard da conexão."""
+    conn.execute(delete(tarefas).where(tarefas.c.dono_id == usuario_id))
+    conn.execute(delete(usuarios).where(usuarios.c.id == usuario_id))
+
+
+def mover_usuario(usuario_id: UUID, destino: str) -> int:
+    """
+    Copia o usuário e suas tarefas para o shard de destino e remove da origem.
+
+    Na origem, a linha do usuário e suas tarefas ficam bloqueadas (FOR UPDATE)
+    durante a cópia, o que também bloqueia novas tarefas desse usuário pela
+    chave estrangeira. O diretório é atualizado antes de liberar os bloqueios,
+    então requisições seguintes já são roteadas para o destino. Escritas que
+    estavam esperando pelos bloqueios falham e podem ser repetidas pelo cliente.
+
+    A operação pode ser repetida após uma falha: cópias deixadas no destino por
+    uma tentativa anterior são apagadas antes da nova cópia, e se a atualização
+    do diretório falhar a cópia é desfeita e a origem continua intacta.
+
+    Args:
+        usuario_id (UUID): Id do usuário a mover.
+        destino (str): Nome do shard de destino.
+
+    Returns:
+        int: Quantidade de tarefas movidas.
+
+    Raises:
+        ValueError: Se o usuário ou o shard não existirem, ou se já estiver no destino.
+    """
+    if destino not in shard_engines:
+        raise ValueError(f"Shard desconhecido: {destino}")
+
+    with directory_engine.connect() as conn:
+        origem = conn.execute(
+            select(diretorio.c.shard).where(diretorio.c.usuario_id == usuario_id)
+        ).scalar()
+    if origem is None:
+        raise ValueError(f"Usuário não encontrado no diretório: {usuario_id}")
+    if origem == destino:
+        raise ValueError(f"Usuário já está no shard {destino}")
+
+    with shard_engines[origem].begin() as conn_origem:
+        usuario = conn_origem.execute(
+            select(usuarios).where(usuarios.c.id == usuario_id).with_for_update()
+        ).mappings().one()
+        linhas = conn_origem.execute(
+            select(tarefas).where(tarefas.c.dono_id == usuario_id).with_for_update()
+        ).mappings().all()
+
+        with shard_engines[destino].begin() as conn_destino:
+            # Restos de uma tentativa interrompida
+            _apagar_usuario(conn_destino, usuario_id)
+            conn_destino.execute(insert(usuarios), [dict(usuario)])
+            if linhas:
+                conn_destino.execute(insert(tarefas), [dict(linha) for linha in linhas])
+
+        # A remoção na origem só é confirmada junto com o fim deste bloco
+        _apagar_usuario(conn_origem, usuario_id)
+
+        atualizacao = (
+            update(diretorio).where(diretorio.c.usuario_id == usuario_id).values(shard=destino)
+        )
+        try:
+            if directory_engine is shard_engines[origem]:
+                # Mesmo banco: uma segunda conexão esperaria pela transação da
+                # origem (no SQLite, "database is locked"); a atualização entra
+                # nela e é confirmada junto com a remoção.
+                conn_origem.execute(atualizacao)
+            else:
+                with directory_engine.begin() as conn:
+                    conn.execute(atualizacao)
+        except Exception:
+            # O diretório ainda aponta para a origem: desfaz a cópia
+            with shard_engines[destino].begin() as conn_destino:
+                _apagar_usuario(conn_destino, usuario_id)
+            raise
+
+    return len(linhas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("usuario_id", type=UUID, help="id do usuário")
+    parser.add_argument("destino", choices=sorted(shard_engines), help="shard de destino")
+    args = parser.parse_args()
+
+    movidas = mover_usuario(args.usuario_id, args.destino)
+    print(f"Usuário {args.usuario_id} movido para {args.destino} ({movidas} tarefas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from uuid import uuid4
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.schemas import UserCreate, Token, UserOut
 from app.security import get_password_hash, verify_password, create_access_token, oauth2_scheme, get_current_user
-from app.repositories import get_user_by_email, create_user
+from app.repositories import get_user_by_email, email_registrado, create_user
 from app.models import Usuario
 from app.database import get_db
 
@@ -23,12 +24,19 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 
     Returns:
         Token: Token JWT de acesso válido por 24h.
+
+    Raises:
+        HTTPException: Se o e-mail já estiver registrado, mesmo que o cadastro anterior não tenha terminado.
     """
-    if get_user_by_email(db, user.email):
+    if email_registrado(db, user.email):
         raise HTTPException(status_code=400, detail="E-mail já registrado")
 
     senha_hash = get_password_hash(user.senha)
-    novo_usuario = create_user(db, user, senha_hash)
+    try:
+        novo_usuario = create_user(db, user, senha_hash)
+    except IntegrityError:
+        # Cadastro concorrente com o mesmo e-mail
+        raise HTTPException(status_code=400, detail="E-mail já registrado")
 
     access_token = create_access_token(
         data={"sub": str(novo_usuario.id)},
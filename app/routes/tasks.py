@@ -1,17 +1,64 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List, Optional
 
-from app.schemas import TarefaBase, TarefaOut
+from app.schemas import TarefaBase, TarefaOut, TarefaResumo, CAMPOS_TAREFA
 from app.database import get_db
 from app.security import get_current_user
 from app.repositories import (
     create_tarefa, get_tarefas_by_user, get_tarefa, update_tarefa, delete_tarefa
 )
+from app.group_commit import FilaCheia, TempoEsgotado
 from app.models import Tarefa
+from app.negotiation import NegotiatedRoute, resposta_negociada
 
-router = APIRouter()
+# Rotas de tarefas respondem em JSON ou MessagePack conforme o cabeçalho Accept
+router = APIRouter(route_class=NegotiatedRoute)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Converte o parâmetro `fields` (ex: "id,titulo,status") em uma lista de campos.
+
+    Args:
+        fields (str, optional): Campos separados por vírgula.
+
+    Returns:
+        Optional[List[str]]: Campos pedidos, ou None se o parâmetro não foi enviado.
+
+    Raises:
+        HTTPException: Se algum campo não existir em TarefaOut.
+    """
+    if fields is None:
+        return None
+    campos = list(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+    invalidos = [c for c in campos if c not in CAMPOS_TAREFA]
+    if not campos or invalidos:
+        raise HTTPException(status_code=400, detail=f"Campos inválidos: {', '.join(invalidos) or fields}")
+    return campos
+
+
+def _parcial(request: Request, conteudo) -> Response:
+    """
+    Responde diretamente com os campos pedidos em `fields`.
+
+    A resposta parcial não passa pelo `response_model` da rota, que continua
+    documentando (e validando) o formato completo usado quando `fields` é omitido.
+
+    Args:
+        request (Request): Requisição atual, usada para negociar o formato.
+        conteudo (dict | list[dict]): Tarefa(s) apenas com os campos pedidos.
+
+    Returns:
+        Response: Resposta em JSON ou MessagePack.
+    """
+    return resposta_negociada(request, conteudo)
+
+
+def _campos(tarefa: Tarefa, campos: List[str]) -> dict:
+    """Lê apenas os campos pedidos, sem tocar nas colunas adiadas."""
+    return {campo: getattr(tarefa, campo) for campo in campos}
 
 @router.post("/", response_model=TarefaOut)
 def criar_tarefa(
@@ -29,35 +76,58 @@ def criar_tarefa(
 
     Returns:
         TarefaOut: Dados da tarefa criada.
+
+    Raises:
+        HTTPException: Se a gravação em lote estiver sobrecarregada (fila cheia ou prazo esgotado).
     """
-    return create_tarefa(db, tarefa, current_user.id)
+    try:
+        return create_tarefa(db, tarefa, current_user.id)
+    except (FilaCheia, TempoEsgotado):
+        raise HTTPException(status_code=503, detail="Servidor sobrecarregado, tente novamente")
 
 
-@router.get("/", response_model=List[TarefaOut])
+@router.get("/", response_model=List[TarefaResumo])
 def listar_tarefas(
+    request: Request,
     status: Optional[str] = None,
     prioridade: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
     """
     Lista todas as tarefas do usuário autenticado com filtros opcionais.
 
+    Sem `fields`, cada tarefa vem no formato TarefaResumo: todos os campos
+    exceto `descricao`, que não é lida do banco. Com `fields`, apenas as
+    colunas pedidas são lidas e devolvidas.
+
     Args:
+        request (Request): Requisição atual.
         status (str, optional): Filtro pelo status da tarefa.
         prioridade (str, optional): Filtro pela prioridade.
+        fields (str, optional): Campos da resposta, separados por vírgula (ex: "id,titulo,status").
         db (Session): Sessão do banco de dados.
         current_user (Usuario): Usuário autenticado.
 
     Returns:
-        List[TarefaOut]: Lista de tarefas encontradas.
+        List[TarefaResumo]: Lista de tarefas encontradas (ou só os campos pedidos).
+
+    Raises:
+        HTTPException: Se algum campo pedido não existir.
     """
-    return get_tarefas_by_user(db, current_user.id, status, prioridade)
+    campos = _parse_fields(fields)
+    tarefas = get_tarefas_by_user(db, current_user.id, status, prioridade, campos)
+    if campos:
+        return _parcial(request, [_campos(tarefa, campos) for tarefa in tarefas])
+    return tarefas
 
 
 @router.get("/{tarefa_id}", response_model=TarefaOut)
 def obter_tarefa(
+    request: Request,
     tarefa_id: UUID,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
@@ -65,19 +135,24 @@ def obter_tarefa(
     Recupera uma tarefa específica do usuário autenticado.
 
     Args:
+        request (Request): Requisição atual.
         tarefa_id (UUID): ID da tarefa.
+        fields (str, optional): Campos da resposta, separados por vírgula. Padrão: todos.
         db (Session): Sessão do banco de dados.
         current_user (Usuario): Usuário autenticado.
 
     Returns:
-        TarefaOut: Dados da tarefa encontrada.
+        TarefaOut: Dados da tarefa encontrada (ou só os campos pedidos).
 
     Raises:
-        HTTPException: Se a tarefa não for encontrada.
+        HTTPException: Se a tarefa não for encontrada ou algum campo pedido não existir.
     """
-    tarefa = get_tarefa(db, tarefa_id, current_user.id)
+    campos = _parse_fields(fields)
+    tarefa = get_tarefa(db, tarefa_id, current_user.id, campos)
     if not tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    if campos:
+        return _parcial(request, _campos(tarefa, campos))
     return tarefa
 
 
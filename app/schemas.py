@@ -58,6 +58,33 @@ class TarefaOut(TarefaBase):
         orm_mode = True
 
 
+# Campos de TarefaOut que podem ser pedidos em ?fields=
+CAMPOS_TAREFA = tuple(TarefaOut.__fields__)
+
+
+class TarefaResumo(BaseModel):
+    """
+    Representa uma tarefa na listagem padrão, sem a descrição.
+
+    A descrição é um texto sem limite e não é lida do banco na listagem;
+    para recebê-la, peça-a em `?fields=`.
+
+    Atributos:
+        Os mesmos de TarefaOut, exceto descricao.
+    """
+    id: UUID
+    titulo: str
+    data_vencimento: Optional[datetime] = None
+    prioridade: PrioridadeEnum
+    status: StatusEnum
+    dono_id: UUID
+    criado_em: datetime
+    atualizada_em: datetime
+
+    class Config:
+        orm_mode = True
+
+
 class UserCreate(BaseModel):
     """
     Representa os dados de entrada para criação de um usuário.
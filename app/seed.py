@@ -0,0 +1,367 @@
+# app/seed.py
+"""
+Popula o banco com usuários e tarefas sintéticos em grande volume.
+
+A distribuição de tarefas por usuário segue uma lei de Zipf (poucos usuários
+concentram muitas tarefas) e status, prioridade e vencimento seguem proporções
+realistas. O resultado é determinístico para a mesma semente, data final e
+tamanho de lote, independente do número de processos.
+
+Uso:
+    python -m app.seed --usuarios 5000 --tarefas 2000000 --seed 42 --truncar
+"""
+import argparse
+import functools
+import io
+import itertools
+import multiprocessing
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.database import directory_engine, shard_engines, shard_ring
+from app.ids import uuid7_int
+
+# Hash bcrypt pré-calculado da senha "senha-seed": todos os usuários gerados
+# fazem login com ela, sem gastar o tempo do seed com bcrypt
+SENHA_SEED = "senha-seed"
+SENHA_SEED_HASH = "$2b$12$jX1cXr46zMiTEGNPSipZBehNyaTzzf2l934Wc1B2VlkhhhRoK5i3u"
+
+# Distribuições (valor, peso)
+STATUS = (("pendente", 30), ("em_andamento", 15), ("concluida", 55))
+PRIORIDADES = (("baixa", 30), ("media", 50), ("alta", 20))
+PROB_VENCIMENTO = 0.6  # fração de tarefas com data de vencimento
+PROB_DESCRICAO = 0.5  # fração de tarefas com descrição
+
+PALAVRAS = (
+    "revisar relatório enviar proposta cliente reunião equipe atualizar planilha "
+    "corrigir erro deploy produção documentar API testar integração pagar conta "
+    "comprar material agendar consulta preparar apresentação responder e-mail"
+).split()
+
+COLUNAS_USUARIOS = ("id", "nome", "email", "senha_hash", "criado_em")
+COLUNAS_DIRETORIO = ("usuario_id", "email", "shard")
+COLUNAS_TAREFAS = (
+    "id", "titulo", "descricao", "data_vencimento", "prioridade",
+    "status", "criado_em", "dono_id", "atualizada_em",
+)
+
+HORA_MS = 3_600_000
+DIA_MS = 24 * HORA_MS
+_ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def _formatar_uuid_pg(h: str) -> str:
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _formatar_uuid_sqlite(h: str) -> str:
+    # No SQLite o SQLAlchemy guarda o UUID como hex sem hífens
+    return h
+
+
+def _formatador_uuid(engine):
+    """Retorna a função que converte o hex de um UUID no texto gravado pelo banco."""
+    return _formatar_uuid_pg if engine.dialect.name == "postgresql" else _formatar_uuid_sqlite
+
+
+def _hex_uuid7(ms: int, getrandbits) -> str:
+    """
+    Gera o hex de um UUIDv7 para o timestamp, a partir do gerador informado.
+
+    Colunas UUID têm afinidade NUMERIC no SQLite, então um hex só com dígitos e
+    no máximo um "e" (ex: "0193e4...") seria convertido em número. Esses casos
+    raros são sorteados de novo, em qualquer banco, para o resultado não
+    depender do dialeto.
+    """
+    while True:
+        h = f"{uuid7_int(ms, getrandbits(74)):032x}"
+        if not h.replace("e", "", 1).isdigit():
+            return h
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _dia(dias: int) -> str:
+    return date.fromordinal(_ORDINAL_EPOCA + dias).isoformat()
+
+
+def _formatar_ms(ms: int) -> str:
+    """Formata um timestamp em ms (UTC) no texto aceito por Postgres e SQLite."""
+    dias, resto = divmod(ms, DIA_MS)
+    horas, resto = divmod(resto, HORA_MS)
+    minutos, resto = divmod(resto, 60_000)
+    segundos, milis = divmod(resto, 1000)
+    return f"{_dia(dias)} {horas:02d}:{minutos:02d}:{segundos:02d}.{milis:03d}000"
+
+
+def gravar(engine, tabela: str, colunas: tuple, linhas: list) -> None:
+    """
+    Grava linhas em massa: COPY no Postgres, executemany no SQLite.
+
+    Args:
+        engine (Engine): Engine do banco de destino.
+        tabela (str): Nome da tabela.
+        colunas (tuple): Nomes das colunas, na ordem dos valores.
+        linhas (list): Tuplas de valores já formatados como texto (ou None).
+
+    Raises:
+        ValueError: Se o banco não for Postgres nem SQLite.
+    """
+    if not linhas:
+        return
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        if engine.dialect.name == "postgresql":
+            buffer = io.StringIO()
+            for linha in linhas:
+                buffer.write("\t".join("\\N" if v is None else v for v in linha))
+                buffer.write("\n")
+            comando = f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN"
+            if engine.dialect.driver == "psycopg2":
+                buffer.seek(0)
+                cursor.copy_expert(comando, buffer)
+            else:
+                with cursor.copy(comando) as copy:
+                    copy.write(buffer.getvalue())
+        elif engine.dialect.name == "sqlite":
+            cursor.execute("PRAGMA synchronous = OFF")
+            marcadores = ", ".join("?" for _ in colunas)
+            cursor.executemany(
+                f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({marcadores})", linhas
+            )
+        else:
+            raise ValueError(f"Banco não suportado pelo seed: {engine.dialect.name}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def truncar() -> None:
+    """Remove todos os usuários, tarefas e entradas do diretório."""
+    for engine in shard_engines.values():
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM tarefas"))
+            conn.execute(text("DELETE FROM usuarios"))
+    with directory_engine.begin() as conn:
+        conn.execute(text("DELETE FROM diretorio_usuarios"))
+
+
+def analisar() -> None:
+    """Atualiza as estatísticas do planejador em cada shard."""
+    for engine in shard_engines.values():
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+
+def seed_usuarios(rng: random.Random, usuarios: int, inicio_ms: int, periodo_ms: int) -> list:
+    """
+    Gera e grava os usuários e suas entradas no diretório.
+
+    Args:
+        rng (Random): Gerador pseudoaleatório.
+        usuarios (int): Quantidade de usuários.
+        inicio_ms (int): Início do período de cadastros, em ms.
+        periodo_ms (int): Duração do período de cadastros, em ms.
+
+    Returns:
+        list: (shard, id formatado para o shard) de cada usuário, na ordem de criação.
+    """
+    donos = []
+    linhas_usuarios = defaultdict(list)
+    linhas_diretorio = []
+    fmt_diretorio = _formatador_uuid(directory_engine)
+    for i in range(usuarios):
+        criado_ms = inicio_ms + periodo_ms * i // usuarios
+        usuario_id = UUID(_hex_uuid7(criado_ms, rng.getrandbits))
+        shard = shard_ring.shard_for(usuario_id)
+        id_fmt = _formatador_uuid(shard_engines[shard])(usuario_id.hex)
+        email = f"usuario{i}@seed.example.com"
+        donos.append((shard, id_fmt))
+        linhas_usuarios[shard].append(
+            (id_fmt, f"Usuário {i}", email, SENHA_SEED_HASH, _formatar_ms(criado_ms))
+        )
+        linhas_diretorio.append((fmt_diretorio(usuario_id.hex), email, shard))
+
+    for shard, linhas in linhas_usuarios.items():
+        gravar(shard_engines[shard], "usuarios", COLUNAS_USUARIOS, linhas)
+    gravar(directory_engine, "diretorio_usuarios", COLUNAS_DIRETORIO, linhas_diretorio)
+    return donos
+
+
+# Contexto compartilhado com os processos que geram os lotes de tarefas
+_ctx = {}
+
+
+def _iniciar_processo(ctx: dict) -> None:
+    _ctx.update(ctx)
+    # Conexões herdadas do processo pai não podem ser reaproveitadas
+    for engine in shard_engines.values():
+        engine.dispose(close=False)
+
+
+def gerar_lote(indice: int) -> dict:
+    """
+    Gera o lote de tarefas de número `indice`, agrupado por shard.
+
+    Cada lote usa um gerador próprio derivado da semente e do índice, então o
+    resultado não depende de qual processo o gerou nem em que ordem.
+
+    Args:
+        indice (int): Número do lote.
+
+    Returns:
+        dict: Mapa shard -> lista de linhas formatadas.
+    """
+    c = _ctx
+    rng = random.Random(f"{c['semente']}:{indice}")
+    random_, getrandbits, expovariate = rng.random, rng.getrandbits, rng.expovariate
+    donos, titulos, descricoes = c["donos"], c["titulos"], c["descricoes"]
+    tarefas, inicio_ms, periodo_ms = c["tarefas"], c["inicio_ms"], c["periodo_ms"]
+    formatos = {shard: _formatador_uuid(engine) for shard, engine in shard_engines.items()}
+
+    offset = indice * c["lote"]
+    n = min(c["lote"], tarefas - offset)
+    sorteados = rng.choices(c["usuarios"], cum_weights=c["acumulado"], k=n)
+    status = rng.choices(*zip(*STATUS), k=n)
+    prioridades = rng.choices(*zip(*PRIORIDADES), k=n)
+    por_shard = defaultdict(list)
+
+    for j in range(n):
+        criado_ms = inicio_ms + periodo_ms * (offset + j) // tarefas
+        criado_em = _formatar_ms(criado_ms)
+        shard, dono = donos[sorteados[j]]
+
+        vencimento = None
+        if random_() < PROB_VENCIMENTO:
+            # Vencimentos caem em horas cheias, alguns dias após a criação
+            horas = 1 + int(expovariate(1 / 240))
+            vencimento = _formatar_ms((criado_ms // HORA_MS + horas) * HORA_MS)
+        descricao = descricoes[getrandbits(10)] if random_() < PROB_DESCRICAO else None
+        atualizada_em = criado_em
+        if status[j] != "pendente":
+            atualizada_em = _formatar_ms(criado_ms + int(expovariate(1 / (2 * DIA_MS))))
+
+        por_shard[shard].append((
+            formatos[shard](_hex_uuid7(criado_ms, getrandbits)),
+            titulos[getrandbits(12)],
+            descricao,
+            vencimento,
+            prioridades[j],
+            status[j],
+            criado_em,
+            dono,
+            atualizada_em,
+        ))
+    return por_shard
+
+
+def gravar_lote(indice: int) -> int:
+    """Gera o lote e grava cada parte no seu shard. Retorna o número de linhas."""
+    por_shard = gerar_lote(indice)
+    for shard, linhas in por_shard.items():
+        gravar(shard_engines[shard], "tarefas", COLUNAS_TAREFAS, linhas)
+    return sum(len(linhas) for linhas in por_shard.values())
+
+
+def seed(usuarios: int, tarefas: int, semente: int, fim: date, dias: int, skew: float,
+         lote: int, processos: int) -> None:
+    """
+    Gera e grava os usuários e as tarefas.
+
+    Os usuários se cadastram ao longo de `dias` dias e as tarefas são criadas
+    nos `dias` dias seguintes, terminando em `fim`. Os ids são UUIDv7 derivados
+    da data de criação, com bits aleatórios vindos da semente.
+
+    No Postgres cada processo gera e grava (COPY) os próprios lotes em paralelo;
+    no SQLite, que aceita um único escritor, os processos só geram os lotes e a
+    gravação fica no processo principal.
+
+    Args:
+        usuarios (int): Quantidade de usuários.
+        tarefas (int): Quantidade de tarefas.
+        semente (int): Semente do gerador pseudoaleatório.
+        fim (date): Data (UTC) em que termina o período de tarefas.
+        dias (int): Duração de cada período (cadastros e tarefas), em dias.
+        skew (float): Expoente da lei de Zipf para tarefas por usuário.
+        lote (int): Tarefas geradas e gravadas por vez.
+        processos (int): Processos usados para gerar os lotes.
+    """
+    rng = random.Random(semente)
+    periodo_ms = dias * DIA_MS
+    fim_ms = (fim - date(1970, 1, 1)).days * DIA_MS
+    inicio_tarefas_ms = fim_ms - periodo_ms
+
+    # Textos sorteados de um conjunto fixo, gerado a partir da mesma semente
+    titulos = [" ".join(rng.sample(PALAVRAS, 3)).capitalize() for _ in range(4096)]
+    descricoes = [" ".join(rng.choices(PALAVRAS, k=rng.randint(5, 60))) for _ in range(1024)]
+
+    donos = seed_usuarios(rng, usuarios, inicio_tarefas_ms - periodo_ms, periodo_ms)
+
+    # O dono de cada tarefa é sorteado com peso de Zipf sobre uma ordem aleatória de usuários
+    ordem = list(range(usuarios))
+    rng.shuffle(ordem)
+    pesos = [0.0] * usuarios
+    for rank, indice in enumerate(ordem, start=1):
+        pesos[indice] = 1 / rank ** skew
+
+    ctx = {
+        "semente": semente, "tarefas": tarefas, "lote": lote,
+        "inicio_ms": inicio_tarefas_ms, "periodo_ms": periodo_ms,
+        "donos": donos, "usuarios": range(usuarios), "acumulado": list(itertools.accumulate(pesos)),
+        "titulos": titulos, "descricoes": descricoes,
+    }
+    lotes = range((tarefas + lote - 1) // lote)
+    paralelo = all(e.dialect.name == "postgresql" for e in shard_engines.values())
+
+    if processos <= 1:
+        _ctx.update(ctx)
+        for indice in lotes:
+            gravar_lote(indice)
+        return
+
+    with multiprocessing.Pool(processos, initializer=_iniciar_processo, initargs=(ctx,)) as pool:
+        if paralelo:
+            for _ in pool.imap_unordered(gravar_lote, lotes):
+                pass
+        else:
+            for por_shard in pool.imap(gerar_lote, lotes):
+                for shard, linhas in por_shard.items():
+                    gravar(shard_engines[shard], "tarefas", COLUNAS_TAREFAS, linhas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--usuarios", type=int, default=5_000)
+    parser.add_argument("--tarefas", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador")
+    parser.add_argument("--fim", type=date.fromisoformat, default=date(2026, 1, 1),
+                        help="data (AAAA-MM-DD) em que termina o período de tarefas")
+    parser.add_argument("--dias", type=int, default=365, help="duração dos períodos de cadastro e de tarefas")
+    parser.add_argument("--skew", type=float, default=1.0, help="expoente de Zipf das tarefas por usuário")
+    parser.add_argument("--lote", type=int, default=20_000, help="tarefas geradas e gravadas por vez")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos geradores")
+    parser.add_argument("--truncar", action="store_true", help="apaga os dados existentes antes")
+    args = parser.parse_args()
+
+    if args.truncar:
+        truncar()
+
+    inicio = time.perf_counter()
+    seed(args.usuarios, args.tarefas, args.seed, args.fim, args.dias, args.skew,
+         args.lote, args.processos)
+    duracao = time.perf_counter() - inicio
+    analisar()
+
+    print(f"{args.usuarios} usuários e {args.tarefas} tarefas em {duracao:.1f}s "
+          f"({(args.usuarios + args.tarefas) / duracao:,.0f} linhas/s)")
+    print(f"Senha de todos os usuários: {SENHA_SEED}")
+
+
+if __name__ == "__main__":
+    main()
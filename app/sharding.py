@@ -0,0 +1,52 @@
+# app/sharding.py
+
+import bisect
+import hashlib
+from typing import Iterable
+from uuid import UUID
+
+# Pontos virtuais por shard: suavizam a distribuição de chaves no anel
+VNODES_POR_SHARD = 128
+
+
+def _hash(valor: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(valor, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Anel de hash consistente que mapeia o id de um usuário para um shard.
+
+    Cada shard ocupa vários pontos virtuais no anel; uma chave pertence ao
+    primeiro ponto encontrado no sentido horário a partir do seu hash. O
+    mapeamento depende apenas dos nomes dos shards, então é estável entre
+    processos e, ao adicionar um shard, só ~1/N das chaves mudam de lugar.
+
+    Args:
+        shards (Iterable[str]): Nomes dos shards.
+        vnodes (int): Pontos virtuais por shard.
+    """
+
+    def __init__(self, shards: Iterable[str], vnodes: int = VNODES_POR_SHARD):
+        pontos = sorted(
+            (_hash(f"{shard}#{i}".encode()), shard)
+            for shard in shards
+            for i in range(vnodes)
+        )
+        if not pontos:
+            raise ValueError("O anel precisa de pelo menos um shard")
+        self._hashes = [h for h, _ in pontos]
+        self._shards = [s for _, s in pontos]
+
+    def shard_for(self, chave: UUID) -> str:
+        """
+        Retorna o shard responsável pela chave.
+
+        Args:
+            chave (UUID): Id do usuário dono dos dados.
+
+        Returns:
+            str: Nome do shard.
+        """
+        indice = bisect.bisect(self._hashes, _hash(chave.bytes))
+        return self._shards[indice % len(self._shards)]
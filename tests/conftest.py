@@ -0,0 +1,39 @@
+# tests/conftest.py
+
+import os
+import tempfile
+
+import pytest
+
+# Dois shards SQLite e o diretório no primeiro, configurados antes de importar o app
+_dir = tempfile.mkdtemp(prefix="todo-api-")
+os.environ["SHARD_DATABASE_URLS"] = ",".join(
+    f"sqlite:///{os.path.join(_dir, f'shard{i}.db')}" for i in range(2)
+)
+os.environ.pop("DIRECTORY_DATABASE_URL", None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, directory_engine, shard_engines  # noqa: E402
+from app.main import app  # noqa: E402
+
+for _engine in {*shard_engines.values(), directory_engine}:
+    Base.metadata.create_all(_engine)
+
+
+@pytest.fixture
+def client():
+    """Cliente HTTP do app, com o ciclo de vida (startup/shutdown) ativo."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def token(client):
+    """Registra um usuário novo e retorna o cabeçalho de autorização dele."""
+    r = client.post(
+        "/auth/register",
+        json={"nome": "Teste", "email": f"teste-{os.urandom(4).hex()}@example.com", "senha": "segredo"},
+    )
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
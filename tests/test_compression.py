@@ -0,0 +1,96 @@
+# tests/test_compression.py
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+import zstandard
+from starlette.datastructures import Headers
+
+from app.compression import CompressionMiddleware, escolher_codificacao
+
+
+def _app(pedacos, headers=()):
+    """App ASGI que responde com os pedaços dados (mais de um = streaming)."""
+    async def app(scope, receive, send):
+        raw = [(k.lower().encode(), v.encode()) for k, v in headers]
+        if len(pedacos) == 1:
+            raw.append((b"content-length", str(len(pedacos[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        for i, pedaco in enumerate(pedacos):
+            await send({"type": "http.response.body", "body": pedaco, "more_body": i < len(pedacos) - 1})
+    return app
+
+
+def _executar(app, accept_encoding, minimum_size=100):
+    """Executa o middleware e devolve (cabeçalhos, corpos de cada mensagem)."""
+    enviadas = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        enviadas.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, receive, send))
+    return Headers(raw=enviadas[0]["headers"]), [m["body"] for m in enviadas[1:]]
+
+
+@pytest.mark.parametrize("accept_encoding, esperada", [
+    ("gzip, zstd", "zstd"),
+    ("gzip", "gzip"),
+    ("zstd;q=0.5, gzip", "gzip"),
+    ("zstd;q=0, gzip;q=0.1", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("*", "zstd"),
+    ("*, zstd;q=0", "gzip"),
+    ("gzip, *;q=0.5", "gzip"),
+])
+def test_escolher_codificacao(accept_encoding, esperada):
+    assert escolher_codificacao(accept_encoding) == esperada
+
+
+def test_resposta_pequena_segue_sem_compressao_mas_com_vary():
+    headers, corpos = _executar(_app([b"x" * 99]), "gzip")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert corpos == [b"x" * 99]
+
+
+def test_resposta_acima_do_limite_e_comprimida():
+    corpo = b"tarefa " * 100
+    headers, corpos = _executar(_app([corpo]), "gzip, zstd")
+    assert headers["content-encoding"] == "zstd"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(corpos[0])
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(corpos[0]) == corpo
+
+    headers, corpos = _executar(_app([corpo]), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(corpos[0]) == corpo
+
+
+def test_streaming_comprime_pedaco_a_pedaco():
+    pedacos = [b"primeiro " * 20, b"segundo " * 20, b"terceiro " * 20]
+    headers, corpos = _executar(_app(pedacos, [("Content-Length", "999")]), "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(corpos) == len(pedacos)
+    # Cada mensagem já pode ser descomprimida assim que chega
+    descompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for pedaco, corpo in zip(pedacos, corpos):
+        assert descompressor.decompress(corpo) == pedaco
+    assert descompressor.eof
+
+
+def test_resposta_ja_codificada_passa_intacta():
+    corpo = b"ja comprimido" * 20
+    headers, corpos = _executar(_app([corpo], [("Content-Encoding", "br")]), "gzip, zstd")
+    assert headers["content-encoding"] == "br"
+    assert headers["content-length"] == str(len(corpo))
+    assert corpos == [corpo]
@@ -0,0 +1,36 @@
+# tests/test_fields.py
+
+import msgpack
+
+from app.main import app
+
+
+def test_openapi_documenta_os_modelos_completos():
+    caminhos = app.openapi()["paths"]
+    esquema = lambda rota: caminhos[rota]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert esquema("/tasks/{tarefa_id}") == {"$ref": "#/components/schemas/TarefaOut"}
+    assert esquema("/tasks/")["items"] == {"$ref": "#/components/schemas/TarefaResumo"}
+
+
+def test_fields_limita_a_resposta(client, token):
+    criada = client.post(
+        "/tasks/",
+        json={"titulo": "campos", "descricao": "longa", "prioridade": "baixa", "status": "pendente"},
+        headers=token,
+    ).json()
+    rota = f"/tasks/{criada['id']}"
+
+    assert client.get(rota, headers=token).json() == criada
+    assert client.get(rota, params={"fields": "id,titulo"}, headers=token).json() == {
+        "id": criada["id"], "titulo": "campos"
+    }
+    em_msgpack = client.get(
+        rota, params={"fields": "titulo"}, headers={**token, "Accept": "application/msgpack"}
+    )
+    assert msgpack.unpackb(em_msgpack.content) == {"titulo": "campos"}
+
+    listadas = client.get("/tasks/", headers=token).json()
+    assert listadas == [{k: v for k, v in criada.items() if k != "descricao"}]
+    assert client.get("/tasks/", params={"fields": "descricao"}, headers=token).json() == [{"descricao": "longa"}]
+    assert client.get("/tasks/", params={"fields": "nada"}, headers=token).status_code == 400
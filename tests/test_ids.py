@@ -0,0 +1,66 @@
+# tests/test_ids.py
+
+import time
+import uuid
+
+import pytest
+
+from app import ids
+from app.ids import uuid7, uuid7_de
+
+T = 1_760_000_000_000  # ms
+
+
+def _ms(u):
+    return u.int >> 80
+
+
+def _contador(u):
+    return (u.int >> 64) & 0xFFF
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio controlado pelo teste e gerador sem estado anterior."""
+    agora = {"ms": T}
+    monkeypatch.setattr(time, "time_ns", lambda: agora["ms"] * 1_000_000)
+    monkeypatch.setattr(ids, "_ultimo_ms", 0)
+    monkeypatch.setattr(ids, "_contador", 0)
+    return agora
+
+
+def test_bits_de_versao_e_variante():
+    for u in (uuid7(), uuid7_de(T, (1 << 74) - 1), uuid7_de(0, 0)):
+        assert u.version == 7
+        assert u.variant == uuid.RFC_4122
+    assert _ms(uuid7_de(T, 0)) == T
+
+
+def test_timestamp_do_relogio(relogio):
+    assert _ms(uuid7()) == T
+
+
+def test_ordenados_no_mesmo_milissegundo(relogio):
+    gerados = [uuid7() for _ in range(1000)]
+    assert gerados == sorted(gerados)
+    assert len(set(gerados)) == len(gerados)
+    assert {_ms(u) for u in gerados} == {T}
+
+
+def test_contador_estourado_avanca_para_o_proximo_milissegundo(relogio, monkeypatch):
+    anterior = uuid7()
+    monkeypatch.setattr(ids, "_contador", 0xFFF)
+
+    seguinte = uuid7()
+    assert _ms(seguinte) == T + 1
+    assert _contador(seguinte) == 0
+    assert seguinte > anterior
+
+
+def test_relogio_voltando_preserva_a_ordem(relogio):
+    antes = uuid7()
+    relogio["ms"] = T - 5_000
+
+    depois = [uuid7() for _ in range(10)]
+    assert [antes, *depois] == sorted([antes, *depois])
+    assert {_ms(u) for u in depois} == {T}
@@ -0,0 +1,39 @@
+# tests/test_negotiation.py
+
+import msgpack
+from fastapi.responses import JSONResponse
+
+
+def test_msgpack_e_json_trazem_o_mesmo_conteudo(client, token):
+    criada = client.post(
+        "/tasks/", json={"titulo": "negociada", "prioridade": "alta", "status": "pendente"}, headers=token
+    )
+    assert criada.status_code == 200
+
+    for rota in ("/tasks/", f"/tasks/{criada.json()['id']}"):
+        em_json = client.get(rota, headers=token)
+        em_msgpack = client.get(rota, headers={**token, "Accept": "application/msgpack"})
+
+        assert em_json.headers["content-type"] == "application/json"
+        assert em_msgpack.headers["content-type"] == "application/msgpack"
+        assert "Accept" in [v.strip() for v in em_msgpack.headers["vary"].split(",")]
+        assert msgpack.unpackb(em_msgpack.content) == em_json.json()
+
+
+def test_json_preferido_quando_tem_qualidade_maior(client, token):
+    r = client.get("/tasks/", headers={**token, "Accept": "application/msgpack;q=0.5, application/json"})
+    assert r.headers["content-type"] == "application/json"
+
+
+def test_json_mantem_o_caminho_rapido_do_fastapi(client, token, monkeypatch):
+    # Sem classe de resposta customizada, o FastAPI serializa com o pydantic
+    # direto para bytes, sem passar por JSONResponse.render
+    def render(self, content):
+        raise AssertionError("JSONResponse.render não deveria ser usado")
+
+    monkeypatch.setattr(JSONResponse, "render", render)
+    client.post("/tasks/", json={"titulo": "rápida", "prioridade": "baixa", "status": "pendente"}, headers=token)
+
+    r = client.get("/tasks/", headers=token)
+    assert r.status_code == 200
+    assert r.json()[0]["titulo"] == "rápida"
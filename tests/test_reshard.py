@@ -0,0 +1,105 @@
+# tests/test_reshard.py
+
+import pytest
+from sqlalchemy import func, select
+
+from app import reshard
+from app.database import SessionLocal, directory_engine, shard_engines
+from app.ids import uuid7
+from app.models import DiretorioUsuario, Tarefa, Usuario
+from app.repositories import get_user_by_email
+
+
+def _contar(shard, usuario_id):
+    with shard_engines[shard].connect() as conn:
+        usuarios = conn.execute(
+            select(func.count()).select_from(Usuario.__table__).where(Usuario.id == usuario_id)
+        ).scalar()
+        tarefas = conn.execute(
+            select(func.count()).select_from(Tarefa.__table__).where(Tarefa.dono_id == usuario_id)
+        ).scalar()
+    return usuarios, tarefas
+
+
+def _cadastrar_no_shard(client, shard):
+    """Cadastra usuários até um cair no shard pedido e cria duas tarefas para ele."""
+    for _ in range(64):
+        email = f"reshard-{uuid7().hex}@example.com"
+        r = client.post("/auth/register", json={"nome": "Reshard", "email": email, "senha": "segredo"})
+        db = SessionLocal()
+        usuario = get_user_by_email(db, email)
+        atual = db.shard
+        db.close()
+        if atual == shard:
+            break
+    assert atual == shard
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    for titulo in ("a", "b"):
+        client.post("/tasks/", json={"titulo": titulo, "prioridade": "baixa", "status": "pendente"}, headers=headers)
+    return usuario.id, headers
+
+
+@pytest.fixture
+def usuario_shard0(client):
+    return _cadastrar_no_shard(client, "shard0")
+
+
+@pytest.fixture
+def usuario_shard1(client):
+    return _cadastrar_no_shard(client, "shard1")
+
+
+def test_falha_no_diretorio_desfaz_a_copia_e_permite_repetir(client, usuario_shard1, monkeypatch):
+    usuario_id, headers = usuario_shard1
+
+    original = reshard.directory_engine
+
+    class DiretorioFora:
+        """Lê normalmente, mas falha ao atualizar o shard do usuário."""
+
+        def connect(self):
+            return original.connect()
+
+        def begin(self):
+            raise RuntimeError("diretório indisponível")
+
+    monkeypatch.setattr(reshard, "directory_engine", DiretorioFora())
+    with pytest.raises(RuntimeError):
+        reshard.mover_usuario(usuario_id, "shard0")
+    monkeypatch.undo()
+
+    assert _contar("shard0", usuario_id) == (0, 0)
+    assert _contar("shard1", usuario_id) == (1, 2)
+
+    assert reshard.mover_usuario(usuario_id, "shard0") == 2
+    assert _contar("shard0", usuario_id) == (1, 2)
+    assert _contar("shard1", usuario_id) == (0, 0)
+    with shard_engines["shard0"].connect() as conn:
+        shard = conn.execute(
+            select(DiretorioUsuario.shard).where(DiretorioUsuario.usuario_id == usuario_id)
+        ).scalar()
+    assert shard == "shard0"
+    assert len(client.get("/tasks/", headers=headers).json()) == 2
+
+
+def test_restos_no_destino_nao_impedem_a_mudanca(usuario_shard1):
+    usuario_id, _ = usuario_shard1
+    with shard_engines["shard1"].connect() as conn:
+        usuario = conn.execute(select(Usuario.__table__).where(Usuario.id == usuario_id)).mappings().one()
+    # Simula uma tentativa anterior que copiou o usuário e parou antes do diretório
+    with shard_engines["shard0"].begin() as conn:
+        conn.execute(Usuario.__table__.insert(), [dict(usuario)])
+
+    assert reshard.mover_usuario(usuario_id, "shard0") == 2
+    assert _contar("shard0", usuario_id) == (1, 2)
+
+
+def test_origem_no_mesmo_banco_do_diretorio(client, usuario_shard0):
+    # O diretório fica no shard0: a atualização usa a transação da origem
+    usuario_id, headers = usuario_shard0
+    assert directory_engine is shard_engines["shard0"]
+
+    assert reshard.mover_usuario(usuario_id, "shard1") == 2
+    assert _contar("shard0", usuario_id) == (0, 0)
+    assert _contar("shard1", usuario_id) == (1, 2)
+    assert len(client.get("/tasks/", headers=headers).json()) == 2
@@ -0,0 +1,43 @@
+# tests/test_usuarios.py
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal, directory_engine, shard_engines
+from app.ids import uuid7
+from app.models import DiretorioUsuario, Usuario
+from app.repositories import create_user
+from app.schemas import UserCreate
+
+
+def test_falha_no_shard_remove_a_entrada_do_diretorio():
+    email = f"orfao-{uuid7().hex}@example.com"
+    # O e-mail já existe em todos os shards (fora do diretório): a linha no shard falha
+    for engine in shard_engines.values():
+        with engine.begin() as conn:
+            conn.execute(
+                Usuario.__table__.insert(), [{"id": uuid7(), "nome": "x", "email": email, "senha_hash": ""}]
+            )
+
+    db = SessionLocal()
+    with pytest.raises(IntegrityError):
+        create_user(db, UserCreate(nome="Órfão", email=email, senha="segredo"), "hash")
+    db.close()
+
+    with directory_engine.connect() as conn:
+        assert conn.execute(select(DiretorioUsuario.usuario_id).where(DiretorioUsuario.email == email)).all() == []
+
+
+def test_entrada_orfa_no_diretorio_reserva_o_email(client):
+    # Sobra de um cadastro cuja linha no shard e a limpeza falharam
+    email = f"orfao-{uuid7().hex}@example.com"
+    with directory_engine.begin() as conn:
+        conn.execute(
+            DiretorioUsuario.__table__.insert(), [{"usuario_id": uuid7(), "email": email, "shard": "shard1"}]
+        )
+
+    r = client.post("/auth/register", json={"nome": "Órfão", "email": email, "senha": "segredo"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "E-mail já registrado"
+    assert client.post("/auth/login", data={"username": email, "password": "segredo"}).status_code == 401